@@ -4,64 +4,66 @@
 """
 
 import os
+from types import MappingProxyType
 
+from common.base_config import MqttBase, env_float, env_int, env_str
 
-class Config:
-    """환경 설정 클래스"""
 
-    # ──────────────────────────────────────────────────────────────
-    # MQTT 브로커 설정
-    # ──────────────────────────────────────────────────────────────
-    MQTT_BROKER_HOST: str = os.getenv("MQTT_BROKER_HOST", "localhost")
-    MQTT_BROKER_PORT: int = int(os.getenv("MQTT_BROKER_PORT", "1883"))
-    MQTT_USERNAME: str = os.getenv("MQTT_USERNAME", "")
-    MQTT_PASSWORD: str = os.getenv("MQTT_PASSWORD", "")
-    MQTT_KEEPALIVE: int = int(os.getenv("MQTT_KEEPALIVE", "60"))
+class Config(MqttBase):
+    """환경 설정 클래스 (MQTT 브로커/공통 설정은 MqttBase 에서 상속)"""
 
     # ──────────────────────────────────────────────────────────────
     # 버스 정보
     # ──────────────────────────────────────────────────────────────
-    BUS_ID: str = os.getenv("BUS_ID", os.uname().nodename)
-    ROUTE_ID: str = os.getenv("ROUTE_ID", "100")
-    ROUTE_NAME: str = os.getenv("ROUTE_NAME", f"노선 {ROUTE_ID}")
+    BUS_ID: str = env_str("BUS_ID", os.uname().nodename)
+    ROUTE_ID: str = env_str("ROUTE_ID", "100")
+    ROUTE_NAME: str = env_str("ROUTE_NAME", f"노선 {ROUTE_ID}")
 
     # ──────────────────────────────────────────────────────────────
     # GPIO 핀 매핑 (BCM 기준)
     # ──────────────────────────────────────────────────────────────
-    LED_RED_PIN: int = int(os.getenv("LED_RED_PIN", "5"))   # 빨간색 LED 바
-    LED_GREEN_PIN: int = int(os.getenv("LED_GREEN_PIN", "6"))  # 초록색 LED 바
-    BUZZER_PIN: int = int(os.getenv("BUZZER_PIN", "13"))
+    LED_RED_PIN: int = env_int("LED_RED_PIN", 5)   # 빨간색 LED 바
+    LED_GREEN_PIN: int = env_int("LED_GREEN_PIN", 6)  # 초록색 LED 바
+    BUZZER_PIN: int = env_int("BUZZER_PIN", 13)
 
-    GPIO_MODE: str = os.getenv("GPIO_MODE", "BCM")  # BCM / BOARD
+    # 개발 PC(Mock GPIO)에서 GPIO 호출을 터미널에 출력할지 여부
+    MOCK_GPIO_VERBOSE: bool = env_str("MOCK_GPIO_VERBOSE", "0") == "1"
 
     # ──────────────────────────────────────────────────────────────
     # 주기 설정
     # ──────────────────────────────────────────────────────────────
-    LOCATION_INTERVAL: float = float(os.getenv("LOCATION_INTERVAL", "2.0"))  # 위치 전송 주기 (초)
-    HEARTBEAT_INTERVAL: int = int(os.getenv("HEARTBEAT_INTERVAL", "30"))
+    LOCATION_INTERVAL: float = env_float("LOCATION_INTERVAL", 2.0)  # 위치 전송 주기 (초)
+    # 위치를 JSON 대신 32바이트 바이너리로 bus/location/bin/{busId} 에 전송
+    USE_BINARY_LOC: bool = env_str("USE_BINARY_LOC", "0") == "1"
 
     # ──────────────────────────────────────────────────────────────
     # 토픽 헬퍼
     # ──────────────────────────────────────────────────────────────
     @classmethod
-    def get_topics(cls):
-        """MQTT 토픽 사전 반환"""
-        return {
-            # 정류장 호출(버튼) 토픽 (stopId, routeId) 와일드카드 두 개
-            "route_call": "device/button/+/+",
+    def _build_topics(cls):
+        """MQTT 토픽 사전 생성 (클래스 정의 직후 한 번만 호출)"""
+        return MappingProxyType({
+            # 정류장 호출(버튼) 토픽 – 브로커가 자기 노선 호출만 전달하도록 stopId 만 와일드카드
+            "route_call": f"device/button/+/{cls.ROUTE_ID}",
             # 버스 위치 전송 토픽
             "bus_location": f"bus/location/{cls.BUS_ID}",
+            # 버스 위치 (바이너리, USE_BINARY_LOC=1 일 때)
+            "bus_location_bin": f"bus/location/bin/{cls.BUS_ID}",
             # 버스 상태
             "bus_status": f"bus/status/{cls.BUS_ID}",
             # 시스템 헬스
-            "system_health": "system/health",
-        }
+            "system_health": cls.SYSTEM_HEALTH_TOPIC,
+        })
+
+    @classmethod
+    def get_topics(cls):
+        """MQTT 토픽 사전 반환 (캐시된 읽기 전용 매핑)"""
+        return cls.TOPICS
 
     # ──────────────────────────────────────────────────────────────
     # 로깅
     # ──────────────────────────────────────────────────────────────
-    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
-    LOG_FILE: str = os.getenv("LOG_FILE", "bus.log")
+    LOG_FILE: str = env_str("LOG_FILE", "bus.log")
 
     @classmethod
     def print_config(cls):  # pragma: no cover
@@ -69,4 +71,8 @@ class Config:
         print("📋  버스 장치 설정 요약")
         for k in dir(cls):
             if k.isupper() and not k.startswith("__"):
-                print(f"  {k}: {getattr(cls, k)}") 
\ No newline at end of file
+                print(f"  {k}: {getattr(cls, k)}") 
+
+
+# 토픽은 설정값이 확정된 뒤 한 번만 계산해 둔다
+Config.TOPICS = Config._build_topics()  # pylint: disable=protected-access
\ No newline at end of file
@@ -6,54 +6,125 @@
 개발 환경에서는 RPi.GPIO 대신 Mock 을 사용해 테스트할 수 있다.
 """
 
+import logging
+import queue
 import threading
 import time
-from typing import Optional
+from typing import Callable, Optional
+
+from .config import Config
+from .logger import setup_logger
 
 
 # ──────────────────────────────────────────────────────────────
 # GPIO 라이브러리 로드 (Mock 지원)
 # ──────────────────────────────────────────────────────────────
 
-try:
-    import RPi.GPIO as GPIO
-    GPIO_AVAILABLE = True
-except ImportError:  # 개발 PC 등
-    GPIO_AVAILABLE = False
-
-    class MockGPIO:  # pylint: disable=too-few-public-methods
-        BCM = "BCM"
-        BOARD = "BOARD"
-        OUT = "OUT"
-        HIGH = True
-        LOW = False
-
-        @staticmethod
-        def setmode(mode):
+
+# Mock 호출 출력 여부 (기본 꺼짐 – 테스트/개발 시 stdout 쓰기 비용 제거)
+_MOCK_VERBOSE = Config.MOCK_GPIO_VERBOSE
+
+
+class MockGPIO:  # pylint: disable=too-few-public-methods
+    BCM = "BCM"
+    BOARD = "BOARD"
+    OUT = "OUT"
+    HIGH = True
+    LOW = False
+
+    @staticmethod
+    def setmode(mode):
+        if _MOCK_VERBOSE:
             print(f"[MOCK GPIO] setmode({mode})")
 
-        @staticmethod
-        def setup(pin, mode, **kwargs):
+    @staticmethod
+    def setup(pin, mode, **kwargs):
+        if _MOCK_VERBOSE:
             print(f"[MOCK GPIO] setup(pin={pin}, mode={mode}, {kwargs})")
 
-        @staticmethod
-        def output(pin, state):
+    @staticmethod
+    def output(pin, state):
+        if _MOCK_VERBOSE:
             print(f"[MOCK GPIO] output(pin={pin}, state={state})")
 
-        @staticmethod
-        def cleanup():
+    @staticmethod
+    def cleanup():
+        if _MOCK_VERBOSE:
             print("[MOCK GPIO] cleanup()")
 
-    GPIO = MockGPIO()  # type: ignore
 
+# RPi.GPIO 는 initialize() 에서 처음 필요할 때 로드한다
+GPIO = None
+GPIO_AVAILABLE = False
 
-from .config import Config
-from .logger import setup_logger
+
+def _load_gpio() -> bool:
+    """RPi.GPIO 지연 로드 (개발 PC 등에서는 Mock 으로 대체)"""
+    global GPIO, GPIO_AVAILABLE  # pylint: disable=global-statement
+    if GPIO is None:
+        try:
+            import RPi.GPIO as rpi_gpio  # pylint: disable=import-outside-toplevel
+            GPIO, GPIO_AVAILABLE = rpi_gpio, True
+        except ImportError:
+            GPIO = MockGPIO()
+    return GPIO_AVAILABLE
 
 
 logger = setup_logger("GPIO")
 
 
+# ──────────────────────────────────────────────────────────────
+# 출력 작업 스레드
+# ──────────────────────────────────────────────────────────────
+
+
+class _OutputWorker:
+    """출력 장치 하나(LED 바, 부저)를 담당하는 상주 작업 스레드
+
+    작업은 ``action(cancel_event, *args)`` 형태로 큐에 쌓이고 순서대로 실행된다.
+    새 작업이 들어오면 진행 중이거나 대기 중인 이전 작업의 취소 이벤트가 설정된다.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._current: Optional[threading.Event] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        with self._lock:
+            if self._current is not None:
+                self._current.set()
+        self._queue.put(None)
+
+    def submit(self, action: Callable, *args):
+        cancel = threading.Event()
+        with self._lock:
+            if self._current is not None:
+                self._current.set()
+            self._current = cancel
+        self._queue.put((action, cancel, args))
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            action, cancel, args = item
+            if cancel.is_set():
+                continue
+            try:
+                action(cancel, *args)
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error("%s 작업 오류: %s", self._name, exc)
+
+
 # ──────────────────────────────────────────────────────────────
 # GPIO 컨트롤러
 # ──────────────────────────────────────────────────────────────
@@ -67,6 +138,12 @@ class GPIOController:  # pylint: disable=too-many-instance-attributes
         self.led_red_state = False
         self.led_green_state = False
         self._lock = threading.Lock()
+        # 핀 번호와 (LOW, HIGH) 출력값 – 출력값은 initialize() 에서 GPIO 상수로 교체
+        self._red_pin = Config.LED_RED_PIN
+        self._green_pin = Config.LED_GREEN_PIN
+        self._levels: tuple = (False, True)
+        self._led_worker = _OutputWorker("gpio-led")
+        self._buzzer_worker = _OutputWorker("gpio-buzzer")
 
     # ──────────────────────────────────────────────────────────
     # 초기화 / 정리
@@ -74,11 +151,16 @@ class GPIOController:  # pylint: disable=too-many-instance-attributes
 
     def initialize(self) -> bool:
         """GPIO 초기화"""
-        if not GPIO_AVAILABLE:
+        self._led_worker.start()
+        self._buzzer_worker.start()
+
+        if not _load_gpio():
             logger.warning("GPIO 모듈을 찾을 수 없어 Mock 모드로 동작합니다")
             return True
 
         try:
+            self._levels = (GPIO.LOW, GPIO.HIGH)
+
             mode = GPIO.BCM if Config.GPIO_MODE.upper() == "BCM" else GPIO.BOARD
             GPIO.setmode(mode)
 
@@ -104,6 +186,8 @@ class GPIOController:  # pylint: disable=too-many-instance-attributes
 
     def cleanup(self):
         """GPIO 정리"""
+        self._led_worker.stop()
+        self._buzzer_worker.stop()
         if GPIO_AVAILABLE and self._initialized:
             GPIO.cleanup()
         logger.info("GPIO 정리 완료")
@@ -113,52 +197,67 @@ class GPIOController:  # pylint: disable=too-many-instance-attributes
     # ──────────────────────────────────────────────────────────
 
     def set_led(self, red: bool = False, green: bool = False):
-        """LED 상태 설정"""
+        """LED 상태 설정 (상태가 바뀐 핀만 출력)"""
         with self._lock:
-            self.led_red_state = red
-            self.led_green_state = green
+            if red == self.led_red_state and green == self.led_green_state:
+                return
 
             if GPIO_AVAILABLE:
-                GPIO.output(Config.LED_RED_PIN, GPIO.HIGH if red else GPIO.LOW)
-                GPIO.output(Config.LED_GREEN_PIN, GPIO.HIGH if green else GPIO.LOW)
+                levels = self._levels
+                if red != self.led_red_state:
+                    GPIO.output(self._red_pin, levels[red])
+                if green != self.led_green_state:
+                    GPIO.output(self._green_pin, levels[green])
             else:
                 logger.debug("[MOCK] LED 상태 → R:%s G:%s", red, green)
 
-    def blink_led(self, duration: float = 2.0, interval: float = 0.3, color: str = "red"):
-        """LED 깜빡임 (비동기)"""
-
-        def _worker():
-            end_time = time.time() + duration
-            while time.time() < end_time:
-                if color == "red":
-                    self.set_led(red=True)
-                elif color == "green":
-                    self.set_led(green=True)
-                time.sleep(interval)
-                self.set_led(False, False)
-                time.sleep(interval)
+            self.led_red_state = red
+            self.led_green_state = green
 
-        threading.Thread(target=_worker, daemon=True).start()
+    def blink_led(self, duration: float = 2.0, interval: float = 0.3, color: str = "red"):
+        """LED 깜빡임 (비동기, 진행 중인 깜빡임은 취소)"""
+        self._led_worker.submit(self._blink, duration, interval, color)
+
+    def _blink(self, cancel: threading.Event, duration: float, interval: float, color: str):
+        end_time = time.monotonic() + duration
+        while time.monotonic() < end_time:
+            if color == "red":
+                self.set_led(red=True)
+            elif color == "green":
+                self.set_led(green=True)
+            if cancel.wait(interval):
+                return
+            self.set_led(False, False)
+            if cancel.wait(interval):
+                return
 
     # ──────────────────────────────────────────────────────────
     # 부저(Buzzer)
     # ──────────────────────────────────────────────────────────
 
     def beep(self, duration: float = 0.2, repeats: int = 1):
-        """부저 비프음"""
+        """부저 비프음 (비동기, 진행 중인 비프음은 취소)"""
+        self._buzzer_worker.submit(self._beep, duration, repeats)
 
-        def _worker():
+    def _beep(self, cancel: threading.Event, duration: float, repeats: int):
+        debug = logger.isEnabledFor(logging.DEBUG)
+        try:
             for _ in range(repeats):
                 if GPIO_AVAILABLE:
                     GPIO.output(Config.BUZZER_PIN, GPIO.HIGH)
-                logger.debug("Beep ON")
-                time.sleep(duration)
+                if debug:
+                    logger.debug("Beep ON")
+                if cancel.wait(duration):
+                    return
                 if GPIO_AVAILABLE:
                     GPIO.output(Config.BUZZER_PIN, GPIO.LOW)
-                logger.debug("Beep OFF")
-                time.sleep(0.05)
-
-        threading.Thread(target=_worker, daemon=True).start()
+                if debug:
+                    logger.debug("Beep OFF")
+                if cancel.wait(0.05):
+                    return
+        finally:
+            if GPIO_AVAILABLE:
+                GPIO.output(Config.BUZZER_PIN, GPIO.LOW)
 
     # ──────────────────────────────────────────────────────────
     # 상태 확인
@@ -1,11 +1,24 @@
 """공통 로거 설정 (버스 장치)"""
 
 import logging
+import sys
 
-import colorlog
+from common.log_format import ColorFormatter
+from common.log_queue import file_queue_handler
 
 from .config import Config
 
+_LOG_FORMAT = "%(asctime)s [%(levelname)8s] %(name)s: %(message)s"
+_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def _console_handler() -> logging.Handler:
+    """콘솔 핸들러 (TTY 일 때만 ANSI 색상 사용)"""
+    handler = logging.StreamHandler()
+    formatter_cls = ColorFormatter if sys.stderr.isatty() else logging.Formatter
+    handler.setFormatter(formatter_cls(_LOG_FORMAT, datefmt=_DATE_FORMAT))
+    return handler
+
 
 def setup_logger(name: str = "Bus") -> logging.Logger:
     """컬러 로거 반환"""
@@ -18,34 +31,15 @@ def setup_logger(name: str = "Bus") -> logging.Logger:
         return logger
 
     # 콘솔 핸들러
-    console_handler = colorlog.StreamHandler()
+    console_handler = _console_handler()
     console_handler.setLevel(logging.DEBUG)
-
-    formatter = colorlog.ColoredFormatter(
-        "%(log_color)s%(asctime)s [%(levelname)8s] %(name)s: %(message)s%(reset)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        log_colors={
-            "DEBUG": "cyan",
-            "INFO": "green",
-            "WARNING": "yellow",
-            "ERROR": "red",
-            "CRITICAL": "red,bg_white",
-        },
-    )
-    console_handler.setFormatter(formatter)
     logger.addHandler(console_handler)
 
-    # 파일 핸들러 (필요 시)
+    # 파일 핸들러 (필요 시, 백그라운드 기록)
     if Config.LOG_FILE:
-        file_handler = logging.FileHandler(Config.LOG_FILE, encoding="utf-8")
-        file_handler.setLevel(logging.INFO)
-        file_handler.setFormatter(
-            logging.Formatter(
-                "%(asctime)s [%(levelname)8s] %(name)s: %(message)s",
-                datefmt="%Y-%m-%d %H:%M:%S",
-            )
+        logger.addHandler(
+            file_queue_handler(Config.LOG_FILE, logging.Formatter(_LOG_FORMAT, datefmt=_DATE_FORMAT))
         )
-        logger.addHandler(file_handler)
 
     return logger
 
@@ -14,21 +14,12 @@ import threading
 import time
 from random import uniform
 
-# 
-# 외부 의존 모듈
-#
-
-try:
-    import gps  # gpsd 클라이언트 (optional)
-    GPS_AVAILABLE = True
-except ImportError:
-    GPS_AVAILABLE = False
-
 # 내부 모듈
 from bus.config import Config
 from bus.gpio_controller import GPIOController
 from bus.logger import setup_logger
 from bus.mqtt_client import MQTTClient
+from bus.scheduler import Scheduler
 
 
 logger = setup_logger("Main")
@@ -39,9 +30,14 @@ class BusDevice:
 
     def __init__(self):
         self.gpio = GPIOController()
-        self.mqtt = MQTTClient()
+        self.scheduler = Scheduler()
+        # gpsd 읽기(session.next)는 블로킹될 수 있어 하트비트와 다른 스레드에서 실행
+        self._location_scheduler = Scheduler("location")
+        self.mqtt = MQTTClient(self.scheduler)
         self._running = False
         self._shutdown_evt = threading.Event()
+        self._gps = None  # gpsd 클라이언트 모듈 (optional, 지연 로드)
+        self._gps_available: bool | None = None
 
     # ────────────────────────────────────────────────────────
     # 초기화
@@ -85,17 +81,30 @@ class BusDevice:
     # ────────────────────────────────────────────────────────
 
     def _start_location_loop(self):
-        def _worker():
-            while self._running and not self._shutdown_evt.is_set():
-                lat, lng, speed, heading = self._get_location()
-                self.mqtt.publish_location(lat, lng, speed, heading)
-                time.sleep(Config.LOCATION_INTERVAL)
+        self._location_scheduler.start()
+        self._location_scheduler.schedule_periodic(Config.LOCATION_INTERVAL, self._publish_location)
 
-        threading.Thread(target=_worker, daemon=True).start()
+    def _publish_location(self):
+        if not self._running:
+            return
+        lat, lng, speed, heading = self._get_location()
+        self.mqtt.publish_location(lat, lng, speed, heading)
+
+    def _load_gps(self):
+        """gps 모듈을 처음 필요할 때 로드 (결과 캐시)"""
+        if self._gps_available is None:
+            try:
+                import gps  # pylint: disable=import-outside-toplevel
+                self._gps = gps
+                self._gps_available = True
+            except ImportError:
+                self._gps_available = False
+        return self._gps
 
     def _get_location(self):
         """GPS 위치를 얻어온다 (GPS가 없는 환경에선 임의값)"""
-        if GPS_AVAILABLE:
+        gps = self._load_gps()
+        if gps is not None:
             try:
                 session = gps.gps(mode=gps.WATCH_ENABLE)
                 report = session.next()
@@ -121,6 +130,8 @@ class BusDevice:
         if not self.initialize():
             return False
 
+        self.scheduler.start()
+
         if not self.mqtt.connect():
             logger.error("MQTT 연결 실패")
             return False
@@ -151,6 +162,8 @@ class BusDevice:
         self._running = False
         self._shutdown_evt.set()
 
+        self._location_scheduler.stop()
+        self.scheduler.stop()
         self.mqtt.disconnect()
         self.gpio.cleanup()
 
@@ -165,24 +178,18 @@ class BusDevice:
 # ────────────────────────────────────────────────────────────
 
 
-bus_device: BusDevice  # 전역 참조용
-
-
-def _signal_handler(signum, frame):  # noqa: D401, D403
-    logger.info("시그널 수신: %s", signum)
-    if "bus_device" in globals():
-        globals()["bus_device"].shutdown()
-    sys.exit(0)
-
-
 def main():
-    global bus_device  # pylint: disable=global-statement
+    bus_device = BusDevice()
+
+    def _signal_handler(signum, frame):  # noqa: D401, D403
+        logger.info("시그널 수신: %s", signum)
+        bus_device.shutdown()
+        sys.exit(0)
 
     # 시그널 핸들러 등록
     signal.signal(signal.SIGINT, _signal_handler)
     signal.signal(signal.SIGTERM, _signal_handler)
 
-    bus_device = BusDevice()
     bus_device.run()
 
 
@@ -3,30 +3,82 @@
 from __future__ import annotations
 
 import json
-import time
+import logging
+import struct
 import threading
-from datetime import datetime
-from typing import Callable, Dict, Optional
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Optional
 
-import paho.mqtt.client as mqtt
+from common.json_codec import dumps as _dumps
+from common.json_codec import loads as _loads
 
 from .config import Config
 from .logger import setup_logger
+from .scheduler import PeriodicJob, Scheduler
+
+if TYPE_CHECKING:
+    import paho.mqtt.client as mqtt
 
 
 logger = setup_logger("MQTT")
 
 
+# ──────────────────────────────────────────────────────────────
+# 발행 페이로드 헬퍼
+# ──────────────────────────────────────────────────────────────
+
+# (epoch 초, "YYYY-MM-DDTHH:MM:SS") – 튜플 하나로 교체해 스레드 간 일관성 유지
+_ts_cache = (0, "")
+
+
+def _now_iso() -> str:
+    """UTC ISO-8601 타임스탬프 (밀리초). 초 단위 문자열은 1초 동안 재사용"""
+    global _ts_cache  # pylint: disable=global-statement
+    sec, rem = divmod(time.time_ns(), 1_000_000_000)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _ts_cache = (sec, prefix)
+    return f"{prefix}.{rem // 1_000_000:03d}Z"
+
+
+def _json_literal(value: str) -> bytes:
+    """%-포맷 템플릿에 끼워 넣을 JSON 문자열 리터럴 (UTF-8 bytes)"""
+    return json.dumps(value).replace("%", "%%").encode()
+
+
+# 바이너리 위치 메시지: 위도, 경도(float64), 속도, 방향(float32), epoch ns(uint64) – 리틀 엔디언 32바이트
+_LOC_STRUCT = struct.Struct("<ddffQ")
+
+# 정류장 호출 토픽 접두사 길이 (device/button/{stopId}/{routeId})
+_ROUTE_CALL_PREFIX_LEN = len("device/button/")
+
+# 위치 메시지: 고정 필드는 미리 직렬화하고 좌표/시각만 채운다 (bytes 그대로 발행)
+_LOCATION_TEMPLATE = (
+    b'{"busId":' + _json_literal(Config.BUS_ID)
+    + b',"routeId":' + _json_literal(Config.ROUTE_ID)
+    + b',"latitude":%.6f,"longitude":%.6f,"speed":%.2f,"heading":%.2f,"timestamp":"%s"}'
+)
+
+
 class MQTTClient:
     """버스 장치용 MQTT 래퍼"""
 
-    def __init__(self):
+    def __init__(self, scheduler: Optional[Scheduler] = None):
         self.client: Optional[mqtt.Client] = None
         self.is_connected: bool = False
-        self.topics = Config.get_topics()
+        self._connected_evt = threading.Event()
+        # 수신 경로에서 매번 레벨 확인을 하지 않도록 한 번만 평가
+        self._log_debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        self.topics = Config.TOPICS
         self.message_callbacks: Dict[str, Callable] = {}
-        self._heartbeat_thread: Optional[threading.Thread] = None
+        # 외부에서 받지 않은 스케줄러는 이 클라이언트가 소유하고 disconnect() 에서 정지
+        self._owns_scheduler = scheduler is None
+        self.scheduler = scheduler or Scheduler("mqtt-scheduler")
+        self._heartbeat_job: Optional[PeriodicJob] = None
         self._running = False
+        self._hb_prefix = b""
+        self._hb_suffix = b'"}'
 
     # ──────────────────────────────────────────────────────────
     # 초기화 / 연결
@@ -34,6 +86,8 @@ class MQTTClient:
 
     def initialize(self) -> bool:
         try:
+            import paho.mqtt.client as mqtt  # pylint: disable=import-outside-toplevel
+
             client_id = f"bus-{Config.BUS_ID}-{int(time.time())}"
             self.client = mqtt.Client(client_id)
 
@@ -46,11 +100,21 @@ class MQTTClient:
             self.client.on_disconnect = self._on_disconnect
             self.client.on_message = self._on_message
 
+            # 토픽별 핸들러 – 라우팅은 paho 의 토픽 매처가 담당
+            self.client.message_callback_add(self.topics["route_call"], self._on_route_call)
+            self.client.message_callback_add(self.topics["system_health"], self._on_system_health)
+
+            # 하트비트 페이로드 – 타임스탬프만 바뀌므로 앞부분을 미리 직렬화
+            self._hb_prefix = b'{"busId":%s,"routeId":%s,"status":"online","timestamp":"' % (
+                json.dumps(Config.BUS_ID).encode(),
+                json.dumps(Config.ROUTE_ID).encode(),
+            )
+
             # 유언 메시지
-            will_payload = json.dumps({
+            will_payload = _dumps({
                 "busId": Config.BUS_ID,
                 "status": "offline",
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": _now_iso(),
             })
             self.client.will_set(self.topics["bus_status"], will_payload, qos=1, retain=True)
 
@@ -67,17 +131,13 @@ class MQTTClient:
 
         try:
             logger.info("MQTT 브로커 연결 시도: %s:%s", Config.MQTT_BROKER_HOST, Config.MQTT_BROKER_PORT)
+            self._connected_evt.clear()
             self.client.connect(Config.MQTT_BROKER_HOST, Config.MQTT_BROKER_PORT, Config.MQTT_KEEPALIVE)
             self.client.loop_start()
             self._running = True
 
-            # 연결 완료 대기 (최대 10초)
-            for _ in range(100):
-                if self.is_connected:
-                    break
-                time.sleep(0.1)
-
-            if self.is_connected:
+            # 연결 완료 대기 (최대 10초, _on_connect 가 이벤트를 설정)
+            if self._connected_evt.wait(timeout=10.0):
                 self._start_heartbeat()
                 self._publish_status("online")
                 return True
@@ -90,10 +150,16 @@ class MQTTClient:
 
     def disconnect(self):
         self._running = False
+        if self._heartbeat_job:
+            self._heartbeat_job.cancel()
+            self._heartbeat_job = None
         if self.client and self.is_connected:
             self._publish_status("offline")
             self.client.loop_stop()
             self.client.disconnect()
+        self._connected_evt.clear()
+        if self._owns_scheduler:
+            self.scheduler.stop()
         logger.info("MQTT 연결 해제 완료")
 
     # ──────────────────────────────────────────────────────────
@@ -103,6 +169,7 @@ class MQTTClient:
     def _on_connect(self, client, userdata, flags, rc):  # noqa: D401
         if rc == 0:
             self.is_connected = True
+            self._connected_evt.set()
             logger.info("MQTT 브로커 연결 성공")
 
             # 구독
@@ -113,39 +180,44 @@ class MQTTClient:
 
     def _on_disconnect(self, client, userdata, rc):  # noqa: D401
         self.is_connected = False
+        self._connected_evt.clear()
         if rc != 0:
             logger.warning("MQTT 연결이 예기치 않게 끊어짐")
         else:
             logger.info("MQTT 연결 해제됨")
 
     def _on_message(self, client, userdata, msg):  # noqa: D401
-        topic = msg.topic
-        payload_raw = msg.payload.decode()
+        # 토픽별 핸들러에 매칭되지 않은 메시지만 여기로 온다
+        if self._log_debug_enabled:
+            logger.debug("처리되지 않은 메시지: %s", msg.topic)
+
+    def _decode_payload(self, msg):
         try:
-            payload = json.loads(payload_raw)
-        except json.JSONDecodeError:
-            payload = payload_raw
-
-        logger.debug("메시지 수신: %s -> %s", topic, payload)
-
-        # 정류장 호출 메시지
-        if topic.startswith("device/button/"):
-            # 토픽 포맷: device/button/{stopId}/{routeId}
-            parts = topic.split("/")
-            if len(parts) >= 4:
-                route_id = parts[-1]
-                stop_id = parts[-2]
-                if route_id == Config.ROUTE_ID:
-                    logger.info("호출 감지: 정류장 %s (노선 %s)", stop_id, route_id)
-                    callback = self.message_callbacks.get("route_call")
-                    if callback:
-                        callback(stop_id, payload)
-
-        # 시스템 헬스
-        elif topic == self.topics["system_health"]:
-            callback = self.message_callbacks.get("system_health")
-            if callback:
-                callback(payload)
+            payload = _loads(msg.payload)
+        except json.JSONDecodeError:  # orjson.JSONDecodeError 포함
+            payload = msg.payload.decode()
+
+        if self._log_debug_enabled:
+            logger.debug("메시지 수신: %s -> %s", msg.topic, payload)
+        return payload
+
+    def _on_route_call(self, client, userdata, msg):  # noqa: D401
+        """정류장 호출 (구독 필터가 이미 자기 노선만 걸러 줌)"""
+        payload = self._decode_payload(msg)
+
+        # 토픽 포맷: device/button/{stopId}/{routeId}
+        topic = msg.topic
+        stop_id = topic[_ROUTE_CALL_PREFIX_LEN:topic.rindex("/")]
+        logger.info("호출 감지: 정류장 %s (노선 %s)", stop_id, Config.ROUTE_ID)
+        callback = self.message_callbacks.get("route_call")
+        if callback:
+            callback(stop_id, payload)
+
+    def _on_system_health(self, client, userdata, msg):  # noqa: D401
+        payload = self._decode_payload(msg)
+        callback = self.message_callbacks.get("system_health")
+        if callback:
+            callback(payload)
 
     # ──────────────────────────────────────────────────────────
     # 메시지 발행
@@ -158,36 +230,38 @@ class MQTTClient:
             "busId": Config.BUS_ID,
             "routeId": Config.ROUTE_ID,
             "status": status,
-            "timestamp": datetime.utcnow().isoformat(),
+            "timestamp": _now_iso(),
         }
-        self.client.publish(self.topics["bus_status"], json.dumps(message), qos=1, retain=True)
+        self.client.publish(self.topics["bus_status"], _dumps(message), qos=1, retain=True)
 
     def publish_location(self, latitude: float, longitude: float, speed: float = 0.0, heading: float = 0.0):
         if not self.client or not self.is_connected:
             return
-        message = {
-            "busId": Config.BUS_ID,
-            "routeId": Config.ROUTE_ID,
-            "latitude": latitude,
-            "longitude": longitude,
-            "speed": speed,
-            "heading": heading,
-            "timestamp": datetime.utcnow().isoformat(),
-        }
-        self.client.publish(self.topics["bus_location"], json.dumps(message), qos=0)
+        if Config.USE_BINARY_LOC:
+            payload = _LOC_STRUCT.pack(latitude, longitude, speed, heading, time.time_ns())
+            self.client.publish(self.topics["bus_location_bin"], payload, qos=0)
+            return
+        payload = _LOCATION_TEMPLATE % (latitude, longitude, speed, heading, _now_iso().encode())
+        self.client.publish(self.topics["bus_location"], payload, qos=0)
 
     # ──────────────────────────────────────────────────────────
     # 헬스/하트비트
     # ──────────────────────────────────────────────────────────
 
-    def _start_heartbeat(self):
-        def _worker():
-            while self._running and self.is_connected:
-                self._publish_status("online")
-                time.sleep(Config.HEARTBEAT_INTERVAL)
+    def _publish_heartbeat(self):
+        """'online' 상태 재발행 (미리 직렬화한 페이로드에 타임스탬프만 결합)"""
+        if not self.client or not self.is_connected:
+            return
+        payload = self._hb_prefix + _now_iso().encode() + self._hb_suffix
+        self.client.publish(self.topics["bus_status"], payload, qos=1, retain=True)
 
-        self._heartbeat_thread = threading.Thread(target=_worker, daemon=True)
-        self._heartbeat_thread.start()
+    def _start_heartbeat(self):
+        if self._heartbeat_job:
+            self._heartbeat_job.cancel()
+        self.scheduler.start()
+        self._heartbeat_job = self.scheduler.schedule_periodic(
+            Config.HEARTBEAT_INTERVAL, self._publish_heartbeat
+        )
 
     # ──────────────────────────────────────────────────────────
     # 콜백 등록
@@ -201,4 +275,5 @@ class MQTTClient:
     # ──────────────────────────────────────────────────────────
 
     def is_healthy(self) -> bool:
-        return self.is_connected and self.client and self.client.is_connected() 
\ No newline at end of file
+        # on_connect/on_disconnect 콜백이 갱신하는 플래그만 확인 (paho 내부 락 생략)
+        return self.is_connected
\ No newline at end of file
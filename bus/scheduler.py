@@ -0,0 +1,123 @@
+"""주기 작업 스케줄러 (버스 장치)
+
+하트비트, 위치 전송처럼 일정 주기로 반복되는 작업을 스레드 하나에서 실행한다.
+작업마다 스레드를 두고 ``time.sleep`` 하던 방식을 대체한다.
+
+모든 작업이 같은 스레드에서 차례로 실행되므로 한 작업이 블로킹되면 나머지 작업도 밀린다.
+GPS 읽기처럼 오래 걸릴 수 있는 작업은 별도 ``Scheduler`` 인스턴스에 등록할 것.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from .logger import setup_logger
+
+
+logger = setup_logger("Scheduler")
+
+
+class PeriodicJob:  # pylint: disable=too-few-public-methods
+    """등록된 주기 작업 핸들"""
+
+    def __init__(self, interval: float, callback: Callable[[], None]):
+        self.interval = interval
+        self.callback = callback
+        self.cancelled = False
+
+    def cancel(self):
+        """다음 실행부터 작업 중단"""
+        self.cancelled = True
+
+
+class Scheduler:
+    """(다음 실행 시각, 작업) 힙을 단일 스레드에서 처리하는 스케줄러"""
+
+    def __init__(self, name: str = "scheduler"):
+        self._name = name
+        self._heap: List[Tuple[float, int, PeriodicJob]] = []
+        self._seq = itertools.count()  # 같은 시각 작업의 순서 보장
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_evt = threading.Event()  # 실행(start)마다 새로 생성
+        self._thread: Optional[threading.Thread] = None
+
+    # ──────────────────────────────────────────────────────────
+    # 시작 / 종료
+    # ──────────────────────────────────────────────────────────
+
+    def start(self):
+        """스케줄러 스레드 시작 (이미 실행 중이면 무시, stop() 후 재시작 가능)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._stop_evt = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run, args=(self._stop_evt,), name=self._name, daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """스케줄러 종료 (대기 중인 스레드를 즉시 깨우고 최대 ``timeout`` 초 대기)"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+            self._stop_evt.set()
+        self._wakeup.set()
+        # 작업 콜백 안에서 stop() 을 호출한 경우 자기 자신은 기다리지 않음
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    # ──────────────────────────────────────────────────────────
+    # 작업 등록
+    # ──────────────────────────────────────────────────────────
+
+    def schedule_periodic(
+        self, interval: float, callback: Callable[[], None], first_delay: float = 0.0
+    ) -> PeriodicJob:
+        """``interval`` 초마다 ``callback`` 실행 (첫 실행은 ``first_delay`` 후)"""
+        job = PeriodicJob(interval, callback)
+        with self._lock:
+            heapq.heappush(self._heap, (time.monotonic() + first_delay, next(self._seq), job))
+        self._wakeup.set()
+        return job
+
+    # ──────────────────────────────────────────────────────────
+    # 실행 루프
+    # ──────────────────────────────────────────────────────────
+
+    def _run(self, stop_evt: threading.Event):
+        while not stop_evt.is_set():
+            # 대기 전에 clear 해야 그 사이 등록된 작업을 놓치지 않는다
+            self._wakeup.clear()
+            with self._lock:
+                if not self._heap:
+                    timeout = None
+                else:
+                    deadline, _, job = self._heap[0]
+                    timeout = deadline - time.monotonic()
+                    if timeout <= 0:
+                        heapq.heappop(self._heap)
+
+            if timeout is None or timeout > 0:
+                self._wakeup.wait(timeout)
+                continue
+
+            if job.cancelled:
+                continue
+
+            try:
+                job.callback()
+            except Exception as exc:  # pylint: disable=broad-except
+                logger.error("주기 작업 오류: %s", exc)
+
+            # 밀린 경우 몰아서 실행하지 않고 현재 시각 기준으로 재정렬
+            next_deadline = deadline + job.interval
+            now = time.monotonic()
+            if next_deadline < now:
+                next_deadline = now + job.interval
+            with self._lock:
+                heapq.heappush(self._heap, (next_deadline, next(self._seq), job))
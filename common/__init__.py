@@ -0,0 +1 @@
+"""버스/정류장 장치 공통 모듈"""
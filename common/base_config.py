@@ -0,0 +1,61 @@
+"""
+장치 공통 설정
+버스 장치(bus/)와 정류장 장치(raspberry/)가 함께 쓰는 MQTT 브로커 설정과
+환경 변수 파싱 헬퍼를 모아 둡니다.
+"""
+
+import os
+
+
+# ──────────────────────────────────────────────────────────────
+# 환경 변수 파싱 헬퍼
+# ──────────────────────────────────────────────────────────────
+
+def env_str(key: str, default: str) -> str:
+    """문자열 환경 변수"""
+    return os.environ.get(key, default)
+
+
+def env_int(key: str, default: int) -> int:
+    """정수 환경 변수 (형식 오류 시 키 이름과 함께 예외)"""
+    raw = os.environ.get(key)
+    if raw is None or raw == "":
+        return default
+    try:
+        return int(raw)
+    except ValueError as exc:
+        raise ValueError(f"환경 변수 {key} 는 정수여야 합니다: {raw!r}") from exc
+
+
+def env_float(key: str, default: float) -> float:
+    """실수 환경 변수 (형식 오류 시 키 이름과 함께 예외)"""
+    raw = os.environ.get(key)
+    if raw is None or raw == "":
+        return default
+    try:
+        return float(raw)
+    except ValueError as exc:
+        raise ValueError(f"환경 변수 {key} 는 실수여야 합니다: {raw!r}") from exc
+
+
+class MqttBase:
+    """장치 공통 설정 (각 장치의 Config 가 상속)"""
+
+    # ──────────────────────────────────────────────────────────────
+    # MQTT 브로커 설정
+    # ──────────────────────────────────────────────────────────────
+    MQTT_BROKER_HOST: str = env_str("MQTT_BROKER_HOST", "localhost")
+    MQTT_BROKER_PORT: int = env_int("MQTT_BROKER_PORT", 1883)
+    MQTT_USERNAME: str = env_str("MQTT_USERNAME", "")
+    MQTT_PASSWORD: str = env_str("MQTT_PASSWORD", "")
+    MQTT_KEEPALIVE: int = env_int("MQTT_KEEPALIVE", 60)
+
+    # 서버가 발행하는 시스템 헬스 토픽 (모든 장치가 구독)
+    SYSTEM_HEALTH_TOPIC: str = "system/health"
+
+    # ──────────────────────────────────────────────────────────────
+    # GPIO / 주기 / 로깅 공통값
+    # ──────────────────────────────────────────────────────────────
+    GPIO_MODE: str = env_str("GPIO_MODE", "BCM")  # BCM / BOARD
+    HEARTBEAT_INTERVAL: int = env_int("HEARTBEAT_INTERVAL", 30)
+    LOG_LEVEL: str = env_str("LOG_LEVEL", "INFO")
@@ -0,0 +1,22 @@
+"""
+장치 공통 JSON 직렬화
+orjson 이 설치되어 있으면 사용하고, 없으면 표준 json 으로 동작합니다.
+``dumps`` 는 항상 bytes 를 반환하고 ``loads`` 는 bytes 를 그대로 받습니다.
+"""
+
+import json
+
+try:
+    from orjson import dumps  # C 구현, bytes 반환
+    from orjson import loads  # bytes 를 디코딩 없이 바로 파싱
+except ImportError:  # orjson 미설치 환경은 표준 json 사용
+
+    def dumps(obj) -> bytes:
+        """간결한 UTF-8 JSON bytes"""
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+    loads = json.loads  # bytes 입력 지원 (UTF-8 자동 판별)
+
+
+# orjson.JSONDecodeError 도 json.JSONDecodeError 의 하위 클래스
+JSONDecodeError = json.JSONDecodeError
@@ -0,0 +1,28 @@
+"""
+장치 공통 로그 포맷터
+레벨별 ANSI 색상 코드를 미리 계산한 표에서 찾아 메시지 앞뒤에 붙입니다.
+"""
+
+import logging
+
+
+_RESET = "\x1b[0m"
+
+
+class ColorFormatter(logging.Formatter):
+    """레벨별 ANSI 색상을 한 줄 전체에 입히는 포맷터"""
+
+    _LEVEL_COLORS = {
+        logging.DEBUG: "\x1b[36m",              # cyan
+        logging.INFO: "\x1b[32m",               # green
+        logging.WARNING: "\x1b[33m",            # yellow
+        logging.ERROR: "\x1b[31m",              # red
+        logging.CRITICAL: "\x1b[31m\x1b[47m",   # red, bg_white
+    }
+
+    def format(self, record: logging.LogRecord) -> str:
+        color = self._LEVEL_COLORS.get(record.levelno)
+        text = super().format(record)
+        if color is None:
+            return text
+        return color + text + _RESET
@@ -0,0 +1,43 @@
+"""
+장치 공통 파일 로그 큐
+로거를 호출한 스레드는 레코드를 큐에 넣기만 하고, 파일 쓰기는 백그라운드 리스너 스레드 하나가 담당합니다.
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+
+# 프로세스 전체에서 하나의 리스너를 공유 (모든 로거의 파일 기록 담당)
+_file_listener: Optional[QueueListener] = None
+
+
+def file_queue_handler(log_file: str, formatter: logging.Formatter, level: int = logging.INFO) -> logging.Handler:
+    """``log_file`` 에 기록하는 리스너를 (최초 1회) 시작하고 그 큐에 연결된 QueueHandler 반환"""
+    global _file_listener  # pylint: disable=global-statement
+    if _file_listener is None:
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setLevel(level)
+        file_handler.setFormatter(formatter)
+        _file_listener = QueueListener(queue.SimpleQueue(), file_handler, respect_handler_level=True)
+        _file_listener.start()
+
+    handler = QueueHandler(_file_listener.queue)
+    handler.setLevel(level)
+    return handler
+
+
+def shutdown_logging():
+    """파일 로그 리스너 종료 (큐에 남은 레코드를 기록하고 파일을 닫음)"""
+    global _file_listener  # pylint: disable=global-statement
+    if _file_listener is None:
+        return
+    listener, _file_listener = _file_listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+atexit.register(shutdown_logging)
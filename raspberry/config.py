@@ -3,19 +3,18 @@
 """
 import os
 import json
+from types import MappingProxyType
 from typing import Dict, Any
 
-class Config:
-    # MQTT 브로커 설정
-    MQTT_BROKER_HOST = os.getenv('MQTT_BROKER_HOST', 'localhost')
-    MQTT_BROKER_PORT = int(os.getenv('MQTT_BROKER_PORT', '1883'))
-    MQTT_USERNAME = os.getenv('MQTT_USERNAME', '')
-    MQTT_PASSWORD = os.getenv('MQTT_PASSWORD', '')
-    MQTT_KEEPALIVE = int(os.getenv('MQTT_KEEPALIVE', '60'))
+# 공통 모듈(common/)은 저장소 루트가 sys.path에 있어야 함 (main.py 또는 PYTHONPATH에서 설정)
+from common.base_config import MqttBase, env_float, env_str
+
+class Config(MqttBase):
+    # MQTT 브로커/GPIO 모드/로그 레벨/하트비트 주기는 MqttBase에서 상속
     
     # 정류장 정보
-    STOP_ID = os.getenv('STOP_ID', 'STOP001')
-    STOP_NAME = os.getenv('STOP_NAME', '시청앞정류장')
+    STOP_ID = env_str('STOP_ID', 'STOP001')
+    STOP_NAME = env_str('STOP_NAME', '시청앞정류장')
     
     # 노선 설정 (기본값)
     DEFAULT_ROUTES_CONFIG = {
@@ -58,26 +57,28 @@ class Config:
         return cls.DEFAULT_ROUTES_CONFIG
     
     # GPIO 설정
-    GPIO_MODE = os.getenv('GPIO_MODE', 'BCM')  # BCM 또는 BOARD
-    DEBOUNCE_TIME = float(os.getenv('DEBOUNCE_TIME', '0.3'))
+    DEBOUNCE_TIME = env_float('DEBOUNCE_TIME', 0.3)
+    GLITCH_FILTER_TIME = env_float('GLITCH_FILTER_TIME', 0.005)  # pigpio 하드웨어 글리치 필터 (초)
     
     # 로깅 설정
-    LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
-    LOG_FILE = os.getenv('LOG_FILE', 'bus_stop.log')
-    
-    # 하트비트 설정
-    HEARTBEAT_INTERVAL = int(os.getenv('HEARTBEAT_INTERVAL', '30'))
+    LOG_FILE = env_str('LOG_FILE', 'bus_stop.log')
     
     # MQTT 토픽 설정
     @classmethod
-    def get_mqtt_topics(cls):
-        return {
+    def _build_mqtt_topics(cls):
+        """MQTT 토픽 생성 (클래스 정의 직후 한 번만 호출)"""
+        return MappingProxyType({
             'button_press': f'device/button/{cls.STOP_ID}',
             'led_control': f'device/led/{cls.STOP_ID}/+',  # +는 routeId를 위한 와일드카드
             'heartbeat': f'device/heartbeat/{cls.STOP_ID}',
             'status': f'device/status/{cls.STOP_ID}',
-            'system_health': 'system/health'
-        }
+            'system_health': cls.SYSTEM_HEALTH_TOPIC
+        })
+    
+    @classmethod
+    def get_mqtt_topics(cls):
+        """MQTT 토픽 조회 (캐시된 읽기 전용 매핑)"""
+        return cls.MQTT_TOPICS
     
     @classmethod
     def validate_config(cls) -> bool:
@@ -117,4 +118,7 @@ class Config:
         for route_id, route_config in cls.get_routes_config().items():
             print(f"    노선 {route_id}: {route_config['name']} "
                   f"(버튼: GPIO{route_config['button_pin']}, "
-                  f"LED: GPIO{route_config['led_pin']})") 
\ No newline at end of file
+                  f"LED: GPIO{route_config['led_pin']})") 
+
+# 토픽은 설정값이 확정된 뒤 한 번만 계산
+Config.MQTT_TOPICS = Config._build_mqtt_topics()
\ No newline at end of file
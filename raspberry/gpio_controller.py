@@ -1,44 +1,18 @@
 """
-GPIO 제어 모듈 - 버튼과 LED 관리
+GPIO 제어 모듈 - 버튼과 LED 관리 (pigpio 데몬 사용)
 """
 import time
 import threading
-from typing import Dict, Callable, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Callable, Iterator, List, Optional, Tuple
 
 try:
-    import RPi.GPIO as GPIO
-    GPIO_AVAILABLE = True
+    import pigpio
+    PIGPIO_AVAILABLE = True
 except ImportError:
-    GPIO_AVAILABLE = False
-    # 개발 환경용 Mock GPIO
-    class MockGPIO:
-        BCM = 'BCM'
-        BOARD = 'BOARD'
-        IN = 'IN'
-        OUT = 'OUT'
-        PUD_UP = 'PUD_UP'
-        PUD_DOWN = 'PUD_DOWN'
-        RISING = 'RISING'
-        FALLING = 'FALLING'
-        HIGH = 'HIGH'
-        LOW = 'LOW'
-        
-        @staticmethod
-        def setmode(mode): pass
-        @staticmethod
-        def setup(pin, mode, **kwargs): pass
-        @staticmethod
-        def output(pin, state): pass
-        @staticmethod
-        def input(pin): return False
-        @staticmethod
-        def add_event_detect(pin, edge, callback=None, bouncetime=0): pass
-        @staticmethod
-        def cleanup(): pass
-        @staticmethod
-        def remove_event_detect(pin): pass
-    
-    GPIO = MockGPIO()
+    # 개발 환경: pigpio가 없으면 Mock 모드로 동작
+    pigpio = None
+    PIGPIO_AVAILABLE = False
 
 from config import Config
 from logger import setup_logger
@@ -48,26 +22,54 @@ logger = setup_logger('GPIO')
 class GPIOController:
     def __init__(self):
         self.routes_config = Config.get_routes_config()
+        # 핀 조회 테이블 (set_led 등 자주 호출되는 경로에서 중첩 dict 조회 제거)
+        self._led_pins: Dict[str, int] = {
+            route_id: route_config['led_pin'] for route_id, route_config in self.routes_config.items()
+        }
+        self._button_pins: Dict[str, int] = {
+            route_id: route_config['button_pin'] for route_id, route_config in self.routes_config.items()
+        }
+        self._pin_to_route: Dict[int, str] = {pin: route_id for route_id, pin in self._button_pins.items()}
+        self._route_ids: Tuple[str, ...] = tuple(self.routes_config)
+        self._route_idx: Dict[str, int] = {route_id: i for i, route_id in enumerate(self._route_ids)}
+        self._route_names: Tuple[str, ...] = tuple(
+            route_config['name'] for route_config in self.routes_config.values()
+        )
         self.button_states: Dict[str, bool] = {}
-        self.led_states: Dict[str, bool] = {}
+        self._led_mask = 0  # LED 상태 비트마스크 (비트 i = _route_ids[i] 노선)
+        self._led_lock = threading.Lock()  # 비트마스크 read-modify-write 보호
         self.button_callbacks: Dict[str, Callable] = {}
-        self.last_button_press: Dict[str, float] = {}
+        self.last_button_press: Dict[str, int] = {}  # 마지막 눌림 시각 (monotonic ns)
+        self._debounce_ns = int(Config.DEBOUNCE_TIME * 1_000_000_000)
+        self.pi = None  # pigpio.pi 연결 (None이면 Mock 모드)
+        self._edge_callbacks: List = []
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='btn')  # 버튼 콜백 실행용
+        self._wave_lock = threading.Lock()  # 깜빡임 상태 보호 (pigpio 데몬은 한 번에 파형 하나만 송출)
+        self._wave: Optional[Tuple[str, int, bool, threading.Timer]] = None  # (노선, wave_id, 복원 상태, 종료 타이머)
+        self._blink_threads: Dict[str, Tuple[threading.Event, bool]] = {}  # 노선 -> (중단 이벤트, 복원 상태)
         self._initialized = False
         
     def initialize(self) -> bool:
         """GPIO 초기화"""
         try:
-            if not GPIO_AVAILABLE:
-                logger.warning("⚠️ GPIO 모듈을 사용할 수 없습니다 (개발 환경)")
+            if not PIGPIO_AVAILABLE:
+                logger.warning("⚠️ pigpio 모듈을 사용할 수 없습니다 (개발 환경)")
                 return True
             
-            # GPIO 모드 설정
-            if Config.GPIO_MODE == 'BCM':
-                GPIO.setmode(GPIO.BCM)
-            else:
-                GPIO.setmode(GPIO.BOARD)
+            # 실제 장치에서 데몬 연결 실패는 오류로 처리 (systemd 재시작으로 재시도)
+            pi = pigpio.pi()
+            if not pi.connected:
+                logger.error("❌ pigpiod 데몬에 연결할 수 없습니다 (sudo systemctl start pigpiod)")
+                pi.stop()
+                return False
+            self.pi = pi
+            
+            # pigpio는 BCM 번호만 사용
+            if Config.GPIO_MODE != 'BCM':
+                logger.warning(f"pigpio는 BCM 핀 번호만 지원합니다 (GPIO_MODE={Config.GPIO_MODE} 무시)")
             
-            logger.info(f"GPIO 모드 설정: {Config.GPIO_MODE}")
+            # 글리치 필터: 이 시간보다 짧은 레벨 변화는 데몬이 샘플링 단계에서 버림
+            glitch_us = int(Config.GLITCH_FILTER_TIME * 1_000_000)
             
             # 각 노선별 GPIO 설정
             for route_id, route_config in self.routes_config.items():
@@ -75,29 +77,25 @@ class GPIOController:
                 led_pin = route_config['led_pin']
                 
                 # 버튼 핀 설정 (풀업 저항 사용)
-                GPIO.setup(button_pin, GPIO.IN, pull_up_down=GPIO.PUD_UP)
+                pi.set_mode(button_pin, pigpio.INPUT)
+                pi.set_pull_up_down(button_pin, pigpio.PUD_UP)
+                pi.set_glitch_filter(button_pin, glitch_us)
                 
                 # LED 핀 설정
-                GPIO.setup(led_pin, GPIO.OUT)
-                GPIO.output(led_pin, GPIO.LOW)  # 초기 상태는 꺼짐
+                pi.set_mode(led_pin, pigpio.OUTPUT)
+                pi.write(led_pin, 0)  # 초기 상태는 꺼짐
                 
                 # 상태 초기화
                 self.button_states[route_id] = False
-                self.led_states[route_id] = False
                 self.last_button_press[route_id] = 0
                 
                 # 버튼 이벤트 감지 (하강 에지 - 버튼 눌림)
-                GPIO.add_event_detect(
-                    button_pin,
-                    GPIO.FALLING,
-                    callback=lambda channel, rid=route_id: self._button_callback(rid, channel),
-                    bouncetime=int(Config.DEBOUNCE_TIME * 1000)  # ms로 변환
-                )
+                self._edge_callbacks.append(pi.callback(button_pin, pigpio.FALLING_EDGE, self._button_dispatch))
                 
                 logger.info(f"노선 {route_id} GPIO 설정 완료 - 버튼: {button_pin}, LED: {led_pin}")
             
             self._initialized = True
-            logger.info("GPIO 초기화 완료")
+            logger.info("GPIO 초기화 완료 (pigpio)")
             return True
             
         except Exception as e:
@@ -106,7 +104,23 @@ class GPIOController:
     
     def cleanup(self):
         """GPIO 정리"""
-        if not GPIO_AVAILABLE or not self._initialized:
+        # 새 버튼 이벤트가 들어오지 않도록 에지 감지를 먼저 해제한 뒤 대기 중인 콜백 작업 취소
+        for edge_callback in self._edge_callbacks:
+            try:
+                edge_callback.cancel()
+            except Exception:
+                pass
+        self._edge_callbacks.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        
+        # 진행 중인 깜빡임 중단 (데몬이 종료 후에도 파형을 계속 송출하지 않도록)
+        with self._wave_lock:
+            self._halt_wave_locked()
+            for stop_event, _ in self._blink_threads.values():
+                stop_event.set()
+            self._blink_threads.clear()
+        
+        if self.pi is None or not self._initialized:
             return
             
         try:
@@ -114,36 +128,41 @@ class GPIOController:
             for route_id in self.routes_config:
                 self.set_led(route_id, False)
             
-            # 이벤트 감지 제거
-            for route_config in self.routes_config.values():
+            # 글리치 필터 해제
+            for button_pin in self._button_pins.values():
                 try:
-                    GPIO.remove_event_detect(route_config['button_pin'])
-                except:
+                    self.pi.set_glitch_filter(button_pin, 0)
+                except Exception:
                     pass
             
-            # GPIO 정리
-            GPIO.cleanup()
+            # pigpiod 연결 종료
+            self.pi.stop()
+            self.pi = None
             logger.info("GPIO 정리 완료")
             
         except Exception as e:
             logger.error(f"GPIO 정리 오류: {e}")
     
-    def _button_callback(self, route_id: str, channel: int):
-        """버튼 눌림 콜백"""
+    def _button_dispatch(self, gpio: int, level: int, tick: int):
+        """버튼 눌림 콜백 (모든 버튼 핀 공용, 핀 번호로 노선 조회)"""
         try:
-            current_time = time.time()
+            route_id = self._pin_to_route.get(gpio)
+            if route_id is None:
+                return
+            
+            now_ns = time.monotonic_ns()
             
-            # 디바운싱 (추가 보호)
-            if current_time - self.last_button_press.get(route_id, 0) < Config.DEBOUNCE_TIME:
+            # 디바운싱 (추가 보호, 시계 보정에 영향받지 않는 단조 시계 사용)
+            if now_ns - self.last_button_press.get(route_id, 0) < self._debounce_ns:
                 return
             
-            self.last_button_press[route_id] = current_time
+            self.last_button_press[route_id] = now_ns
             
             # 버튼 상태 업데이트
             self.button_states[route_id] = True
             
             route_config = self.routes_config[route_id]
-            logger.info(f"🔴 버튼 눌림: 노선 {route_id} ({route_config['name']})")
+            logger.info("🔴 버튼 눌림: 노선 %s (%s)", route_id, route_config['name'])
             
             # LED 켜기
             self.set_led(route_id, True)
@@ -151,12 +170,8 @@ class GPIOController:
             # 콜백 호출
             callback = self.button_callbacks.get(route_id)
             if callback:
-                # 별도 스레드에서 콜백 실행 (블로킹 방지)
-                threading.Thread(
-                    target=callback,
-                    args=(route_id, route_config),
-                    daemon=True
-                ).start()
+                # 스레드 풀에서 콜백 실행 (블로킹 방지)
+                self._executor.submit(callback, route_id, route_config)
             
         except Exception as e:
             logger.error(f"버튼 콜백 오류: {e}")
@@ -169,43 +184,83 @@ class GPIOController:
     def set_led(self, route_id: str, state: bool) -> bool:
         """LED 상태 설정"""
         try:
-            if route_id not in self.routes_config:
+            led_pin = self._led_pins.get(route_id)
+            if led_pin is None:
                 logger.error(f"알 수 없는 노선: {route_id}")
                 return False
             
-            if not GPIO_AVAILABLE:
-                logger.debug(f"Mock LED {route_id}: {'ON' if state else 'OFF'}")
-                self.led_states[route_id] = state
+            if self.pi is None:
+                logger.debug("Mock LED %s: %s", route_id, 'ON' if state else 'OFF')
+                self._store_led_state(route_id, state)
                 return True
             
-            led_pin = self.routes_config[route_id]['led_pin']
-            GPIO.output(led_pin, GPIO.HIGH if state else GPIO.LOW)
-            self.led_states[route_id] = state
+            self.pi.write(led_pin, 1 if state else 0)
+            self._store_led_state(route_id, state)
             
-            logger.info(f"💡 LED {route_id}: {'켜짐' if state else '꺼짐'}")
+            logger.info("💡 LED %s: %s", route_id, '켜짐' if state else '꺼짐')
             return True
             
         except Exception as e:
             logger.error(f"LED 제어 오류 (노선 {route_id}): {e}")
             return False
     
+    def _store_led_state(self, route_id: str, state: bool):
+        """LED 상태 비트 갱신"""
+        bit = 1 << self._route_idx[route_id]
+        with self._led_lock:
+            if state:
+                self._led_mask |= bit
+            else:
+                self._led_mask &= ~bit
+    
+    @property
+    def led_states(self) -> Dict[str, bool]:
+        """노선별 LED 상태 (비트마스크에서 만든 읽기용 dict)"""
+        mask = self._led_mask
+        return {route_id: bool(mask >> i & 1) for i, route_id in enumerate(self._route_ids)}
+    
     def toggle_led(self, route_id: str) -> bool:
         """LED 토글"""
-        current_state = self.led_states.get(route_id, False)
-        return self.set_led(route_id, not current_state)
+        return self.set_led(route_id, not self.get_led_state(route_id))
     
     def blink_led(self, route_id: str, duration: float = 2.0, interval: float = 0.5):
-        """LED 깜빡임"""
+        """LED 깜빡임 (pigpio 파형 우선, 불가하면 스레드로 대체)
+        
+        같은 노선에서 진행 중인 깜빡임은 새 요청으로 교체되며, 복원 상태는 처음 깜빡임 이전 상태를 유지한다.
+        """
+        if route_id not in self._led_pins:
+            logger.error(f"알 수 없는 노선: {route_id}")
+            return
+        
+        with self._wave_lock:
+            original_state = self._cancel_blink_locked(route_id)
+            if original_state is None:
+                original_state = self.get_led_state(route_id)
+            
+            if self._blink_with_wave(route_id, duration, interval, original_state):
+                return
+            
+            stop_event = threading.Event()
+            self._blink_threads[route_id] = (stop_event, original_state)
+        
         def blink_worker():
             try:
-                original_state = self.led_states.get(route_id, False)
-                start_time = time.time()
+                deadline = time.monotonic()
+                end_time = deadline + duration
+                state = True
                 
-                while time.time() - start_time < duration:
-                    self.set_led(route_id, True)
-                    time.sleep(interval)
-                    self.set_led(route_id, False)
-                    time.sleep(interval)
+                # 절대 마감 시각 기준으로 대기해 늦게 깨어난 만큼 다음 대기를 줄임 (누적 오차 방지)
+                while time.monotonic() < end_time:
+                    self.set_led(route_id, state)
+                    state = not state
+                    deadline += interval
+                    if stop_event.wait(max(0.0, deadline - time.monotonic())):
+                        return  # 새 깜빡임으로 교체되었거나 종료 중 - 복원은 교체한 쪽이 담당
+                
+                with self._wave_lock:
+                    if self._blink_threads.get(route_id, (None,))[0] is not stop_event:
+                        return
+                    del self._blink_threads[route_id]
                 
                 # 원래 상태로 복원
                 self.set_led(route_id, original_state)
@@ -215,13 +270,83 @@ class GPIOController:
         
         threading.Thread(target=blink_worker, daemon=True).start()
     
+    def _blink_with_wave(self, route_id: str, duration: float, interval: float, original_state: bool) -> bool:
+        """pigpio 파형으로 LED 깜빡임 - 데몬의 DMA가 타이밍을 처리하므로 파이썬 루프가 없음 (_wave_lock 보유 상태에서 호출)"""
+        if self.pi is None:
+            return False
+        
+        # 다른 노선의 파형이 송출 중이면 스레드 방식으로 처리
+        if self._wave is not None or self.pi.wave_tx_busy():
+            return False
+        
+        try:
+            pin_mask = 1 << self._led_pins[route_id]
+            half_period_us = int(interval * 1_000_000)
+            
+            self.pi.wave_add_new()
+            self.pi.wave_add_generic([
+                pigpio.pulse(pin_mask, 0, half_period_us),
+                pigpio.pulse(0, pin_mask, half_period_us)
+            ])
+            wave_id = self.pi.wave_create()
+            self.pi.wave_send_repeat(wave_id)
+        except Exception as e:
+            logger.error(f"LED 파형 생성 오류 (노선 {route_id}): {e}")
+            return False
+        
+        timer = threading.Timer(duration, self._stop_wave, args=(wave_id,))
+        timer.daemon = True
+        self._wave = (route_id, wave_id, original_state, timer)
+        timer.start()
+        return True
+    
+    def _halt_wave_locked(self):
+        """송출 중인 파형과 타이머 정리 (_wave_lock 보유 상태에서 호출, LED 복원은 하지 않음)"""
+        if self._wave is None:
+            return
+        _, wave_id, _, timer = self._wave
+        self._wave = None
+        timer.cancel()
+        try:
+            if self.pi is not None:
+                self.pi.wave_tx_stop()
+                self.pi.wave_delete(wave_id)
+        except Exception as e:
+            logger.error(f"LED 파형 정리 오류: {e}")
+    
+    def _cancel_blink_locked(self, route_id: str) -> Optional[bool]:
+        """해당 노선의 진행 중인 깜빡임 중단 후 그 깜빡임의 복원 상태 반환 (없으면 None)"""
+        if self._wave is not None and self._wave[0] == route_id:
+            original_state = self._wave[2]
+            self._halt_wave_locked()
+            return original_state
+        
+        blink = self._blink_threads.pop(route_id, None)
+        if blink is not None:
+            stop_event, original_state = blink
+            stop_event.set()
+            return original_state
+        return None
+    
+    def _stop_wave(self, wave_id: int):
+        """타이머 만료: 파형 송출 중지 후 LED를 원래 상태로 복원"""
+        with self._wave_lock:
+            # 이미 교체되었거나 정리된 파형이면 무시
+            if self._wave is None or self._wave[1] != wave_id:
+                return
+            route_id, _, original_state, _ = self._wave
+            self._halt_wave_locked()
+        
+        self.set_led(route_id, original_state)
+    
     def get_button_state(self, route_id: str) -> bool:
         """버튼 상태 조회"""
         return self.button_states.get(route_id, False)
     
     def get_led_state(self, route_id: str) -> bool:
         """LED 상태 조회"""
-        return self.led_states.get(route_id, False)
+        idx = self._route_idx.get(route_id)
+        return idx is not None and bool(self._led_mask >> idx & 1)
     
     def get_all_states(self) -> Dict[str, Dict[str, bool]]:
         """모든 상태 조회"""
@@ -233,6 +358,13 @@ class GPIOController:
             for route_id in self.routes_config
         }
     
+    def iter_states(self) -> Iterator[Tuple[str, str, bool]]:
+        """노선별 (route_id, 노선 이름, LED 켜짐 여부) 순회"""
+        mask = self._led_mask
+        for route_id, name in zip(self._route_ids, self._route_names):
+            yield route_id, name, bool(mask & 1)
+            mask >>= 1
+    
     def test_all_leds(self, duration: float = 1.0):
         """모든 LED 테스트"""
         logger.info("LED 테스트 시작")
@@ -248,4 +380,4 @@ class GPIOController:
     
     def is_available(self) -> bool:
         """GPIO 사용 가능 여부"""
-        return GPIO_AVAILABLE and self._initialized 
\ No newline at end of file
+        return self.pi is not None and self._initialized 
\ No newline at end of file
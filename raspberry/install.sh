@@ -16,13 +16,26 @@ fi
 INSTALL_DIR=$(pwd)
 echo "📁 설치 디렉토리: $INSTALL_DIR"
 
+# 공통 모듈(common/) 확인 - raspberry/ 와 같은 위치에 있어야 함
+COMMON_DIR=$(dirname "$INSTALL_DIR")/common
+if [ ! -f "$COMMON_DIR/base_config.py" ]; then
+    echo "❌ 공통 모듈을 찾을 수 없습니다: $COMMON_DIR"
+    echo "   저장소의 common/ 디렉토리를 raspberry/ 와 같은 위치에 복사해주세요."
+    exit 1
+fi
+echo "📁 공통 모듈: $COMMON_DIR"
+
 # 1. 시스템 업데이트
 echo "🔄 시스템 업데이트 중..."
 sudo apt update && sudo apt upgrade -y
 
 # 2. 필수 패키지 설치
 echo "📦 필수 패키지 설치 중..."
-sudo apt install -y python3-pip python3-venv git mosquitto-clients
+sudo apt install -y python3-pip python3-venv git mosquitto-clients pigpio
+
+# pigpio 데몬 (버튼/LED GPIO 처리)
+echo "⚡ pigpiod 데몬 활성화 중..."
+sudo systemctl enable --now pigpiod
 
 # 3. Python 의존성 설치
 echo "🐍 Python 의존성 설치 중..."
@@ -2,9 +2,17 @@
 로깅 설정 모듈
 """
 import logging
-import colorlog
+import sys
+
+from common.log_format import ColorFormatter
+from common.log_queue import file_queue_handler
 from config import Config
 
+# 레코드마다 스레드/프로세스 정보를 조회하지 않음 (포맷에서 사용하지 않는 필드)
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
 def setup_logger(name: str = 'BusStop') -> logging.Logger:
     """컬러 로거 설정"""
     
@@ -16,37 +24,26 @@ def setup_logger(name: str = 'BusStop') -> logging.Logger:
     if logger.handlers:
         return logger
     
-    # 콘솔 핸들러 (컬러 출력)
-    console_handler = colorlog.StreamHandler()
+    # 콘솔 핸들러 (TTY일 때만 컬러 출력 - systemd/journald에는 ANSI 코드 제외)
+    console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.DEBUG)
     
-    # 컬러 포맷터
-    color_formatter = colorlog.ColoredFormatter(
-        "%(log_color)s%(asctime)s [%(levelname)8s] %(name)s: %(message)s%(reset)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        log_colors={
-            'DEBUG': 'cyan',
-            'INFO': 'green',
-            'WARNING': 'yellow',
-            'ERROR': 'red',
-            'CRITICAL': 'red,bg_white',
-        }
+    formatter_cls = ColorFormatter if sys.stderr.isatty() else logging.Formatter
+    console_formatter = formatter_cls(
+        "%(asctime)s [%(levelname)8s] %(name)s: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S"
     )
-    console_handler.setFormatter(color_formatter)
+    console_handler.setFormatter(console_formatter)
     logger.addHandler(console_handler)
     
-    # 파일 핸들러
+    # 파일 핸들러 (백그라운드 기록)
     if Config.LOG_FILE:
-        file_handler = logging.FileHandler(Config.LOG_FILE, encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
-        
         # 파일용 포맷터 (컬러 없음)
         file_formatter = logging.Formatter(
             "%(asctime)s [%(levelname)8s] %(name)s: %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
         )
-        file_handler.setFormatter(file_formatter)
-        logger.addHandler(file_handler)
+        logger.addHandler(file_queue_handler(Config.LOG_FILE, file_formatter))
     
     return logger
 
@@ -5,9 +5,14 @@
 import os
 import sys
 import signal
-import time
+import selectors
 import threading
-from datetime import datetime
+from typing import Callable, Dict
+
+# 저장소 루트의 공통 모듈(common/) 경로 추가 - systemd에서는 PYTHONPATH로 지정
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPO_ROOT not in sys.path:
+    sys.path.append(_REPO_ROOT)
 
 # 환경 변수 로드
 try:
@@ -23,12 +28,40 @@ from gpio_controller import GPIOController
 
 logger = setup_logger('Main')
 
+# 주기적 상태 출력 간격 (초)
+STATUS_INTERVAL = 300
+
 class BusStopSystem:
     def __init__(self):
         self.mqtt_client = MQTTClient()
         self.gpio_controller = GPIOController()
         self._running = False
         self._shutdown_event = threading.Event()
+        self._timers: Dict[str, threading.Timer] = {}
+        
+        # 메인 스레드를 깨우는 파이프 (시그널 번호 또는 종료 요청 바이트가 기록됨)
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        os.set_blocking(self._wakeup_r, False)
+        os.set_blocking(self._wakeup_w, False)
+    
+    def install_signal_wakeup(self):
+        """SIGINT/SIGTERM 수신 시 파이썬 핸들러 대신 파이프에 기록되도록 설정 (메인 스레드에서 호출)
+        
+        시작 단계가 끝난 뒤 대기 루프 직전에 호출한다. 그 전에는 main()의 핸들러가 즉시 중단시킨다.
+        """
+        signal.set_wakeup_fd(self._wakeup_w)
+        # 기본 동작(KeyboardInterrupt/즉시 종료)을 막기 위한 빈 핸들러
+        signal.signal(signal.SIGINT, _ignore_signal)
+        signal.signal(signal.SIGTERM, _ignore_signal)
+    
+    def _close_wakeup(self):
+        """웨이크업 파이프 해제 (메인 스레드에서만 - 다른 스레드에서는 대기 중인 select를 방해하지 않도록 보류)"""
+        if self._wakeup_r < 0 or threading.current_thread() is not threading.main_thread():
+            return
+        signal.set_wakeup_fd(-1)
+        os.close(self._wakeup_r)
+        os.close(self._wakeup_w)
+        self._wakeup_r = self._wakeup_w = -1
         
     def initialize(self) -> bool:
         """시스템 초기화"""
@@ -62,7 +95,7 @@ class BusStopSystem:
         """이벤트 핸들러 설정"""
         
         # 버튼 콜백 등록
-        for route_id in Config.get_routes_config():
+        for route_id in self.gpio_controller.routes_config:
             self.gpio_controller.register_button_callback(
                 route_id,
                 self._on_button_pressed
@@ -80,11 +113,7 @@ class BusStopSystem:
             logger.info(f"🔴 버튼 이벤트: 노선 {route_id} 호출")
             
             # MQTT로 버튼 클릭 전송
-            success = self.mqtt_client.publish_button_press(
-                route_id,
-                route_config['name'],
-                route_config['color']
-            )
+            success = self.mqtt_client.publish_button_press(route_id)
             
             if success:
                 logger.info(f"✅ 노선 {route_id} 호출 전송 성공")
@@ -141,26 +170,21 @@ class BusStopSystem:
         logger.info("🚏 버스정류장 시스템 준비 완료")
         return True
     
-    def run(self):
-        """메인 루프 실행"""
-        if not self.start():
-            logger.error("❌ 시스템 시작 실패")
-            return
-        
+    def run(self) -> bool:
+        """메인 루프 실행 (시작 실패 시 False)"""
         try:
+            # 시작 단계(MQTT 연결 대기, LED 테스트) 중 시그널은 KeyboardInterrupt로 즉시 중단
+            if not self.start():
+                logger.error("❌ 시스템 시작 실패")
+                return False
+            
             logger.info("🔄 시스템 실행 중... (Ctrl+C로 종료)")
             
-            # 메인 루프
-            while self._running and not self._shutdown_event.is_set():
-                # 상태 모니터링
-                if not self.mqtt_client.is_healthy():
-                    logger.warning("⚠️ MQTT 연결 문제 감지")
-                
-                # 주기적 상태 출력 (5분마다)
-                if int(time.time()) % 300 == 0:
-                    self._print_status()
-                
-                time.sleep(1)
+            # 주기 작업은 타이머로 실행하고 메인 스레드는 시그널/종료 요청까지 대기
+            threading.Thread(target=self._monitor_connection, name='mqtt-monitor', daemon=True).start()
+            self._start_periodic('status', STATUS_INTERVAL, self._print_status)
+            self.install_signal_wakeup()
+            self._wait_for_wakeup()
         
         except KeyboardInterrupt:
             logger.info("🛑 사용자 종료 요청")
@@ -168,27 +192,81 @@ class BusStopSystem:
             logger.error(f"❌ 시스템 오류: {e}")
         finally:
             self.shutdown()
+            self._close_wakeup()
+        return True
+    
+    def _wait_for_wakeup(self):
+        """웨이크업 파이프가 읽힐 때까지 블로킹 (시그널 또는 shutdown() 호출)"""
+        with selectors.DefaultSelector() as selector:
+            selector.register(self._wakeup_r, selectors.EVENT_READ)
+            while not self._shutdown_event.is_set():
+                selector.select()
+                try:
+                    data = os.read(self._wakeup_r, 64)
+                except BlockingIOError:
+                    continue
+                # 0이 아닌 바이트는 set_wakeup_fd가 기록한 시그널 번호
+                signums = [b for b in data if b]
+                if signums:
+                    logger.info("🛑 시그널 수신: %s", signums[0])
+                    return
+    
+    def _start_periodic(self, name: str, interval: float, func: Callable[[], None]):
+        """interval초 후 func 실행 후 재등록 (종료 이벤트가 설정되면 중단)"""
+        def tick():
+            if self._shutdown_event.is_set():
+                return
+            try:
+                func()
+            except Exception as e:
+                logger.error(f"주기 작업 오류 ({name}): {e}")
+            self._start_periodic(name, interval, func)
+        
+        timer = threading.Timer(interval, tick)
+        timer.daemon = True
+        self._timers[name] = timer
+        timer.start()
+    
+    def _monitor_connection(self):
+        """MQTT 연결 끊김 이벤트 감시 (keepalive는 paho가 처리하므로 폴링하지 않음)"""
+        while not self._shutdown_event.is_set():
+            if not self.mqtt_client.wait_for_disconnect(timeout=Config.HEARTBEAT_INTERVAL):
+                continue
+            if self._shutdown_event.is_set():
+                break
+            logger.warning("⚠️ MQTT 연결 문제 감지")
+            # 끊긴 동안에는 하트비트 주기마다 한 번만 경고
+            self._shutdown_event.wait(Config.HEARTBEAT_INTERVAL)
     
     def _print_status(self):
         """현재 상태 출력"""
-        states = self.gpio_controller.get_all_states()
         logger.info("📊 시스템 상태:")
         logger.info(f"  MQTT 연결: {'✅' if self.mqtt_client.is_healthy() else '❌'}")
         logger.info(f"  GPIO 사용 가능: {'✅' if self.gpio_controller.is_available() else '❌'}")
         logger.info("  노선별 상태:")
         
-        for route_id, state in states.items():
-            route_config = Config.get_routes_config()[route_id]
-            logger.info(f"    노선 {route_id} ({route_config['name']}): "
-                       f"LED {'🔴' if state['led'] else '⚫'}")
+        for route_id, name, led_on in self.gpio_controller.iter_states():
+            logger.info("    노선 %s (%s): LED %s", route_id, name, '🔴' if led_on else '⚫')
     
     def shutdown(self):
-        """시스템 종료"""
+        """시스템 종료 (여러 번 호출되어도 한 번만 정리)"""
+        if self._shutdown_event.is_set():
+            return
         logger.info("🔄 시스템 종료 중...")
         
         self._running = False
         self._shutdown_event.set()
         
+        # 대기 중인 메인 스레드 깨우기
+        try:
+            os.write(self._wakeup_w, b'\0')
+        except OSError:
+            pass
+        
+        # 주기 작업 타이머 중단
+        for timer in self._timers.values():
+            timer.cancel()
+        
         # MQTT 연결 해제
         if self.mqtt_client:
             self.mqtt_client.disconnect()
@@ -197,27 +275,27 @@ class BusStopSystem:
         if self.gpio_controller:
             self.gpio_controller.cleanup()
         
+        self._close_wakeup()
         logger.info("✅ 시스템 종료 완료")
 
-def signal_handler(signum, frame):
-    """시그널 핸들러"""
-    logger.info(f"시그널 수신: {signum}")
-    if 'bus_stop_system' in globals():
-        bus_stop_system.shutdown()
-    sys.exit(0)
+def _ignore_signal(signum, frame):
+    """빈 시그널 핸들러 - 실제 처리는 웨이크업 파이프를 읽는 메인 루프에서 수행"""
+
+def _interrupt_startup(signum, frame):
+    """시작 단계 시그널 핸들러 - 진행 중인 대기를 KeyboardInterrupt로 중단"""
+    raise KeyboardInterrupt
 
 def main():
     """메인 함수"""
-    global bus_stop_system
-    
-    # 시그널 핸들러 등록
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
-    
     try:
-        # 시스템 생성 및 실행
+        # 시스템 생성, 시그널 연결 후 실행
+        signal.signal(signal.SIGINT, _interrupt_startup)
+        signal.signal(signal.SIGTERM, _interrupt_startup)
+        
         bus_stop_system = BusStopSystem()
-        bus_stop_system.run()
+        if not bus_stop_system.run():
+            # 0이 아닌 종료 코드로 systemd(Restart=on-failure)가 재시도하도록 함
+            sys.exit(1)
         
     except Exception as e:
         logger.error(f"❌ 시스템 실행 오류: {e}")
@@ -1,24 +1,77 @@
 """
 MQTT 클라이언트 모듈
 """
-import json
+import socket
 import time
 import threading
-from datetime import datetime
 from typing import Dict, Callable, Any
 import paho.mqtt.client as mqtt
 
+from common.json_codec import dumps as _dumps
+from common.json_codec import loads as _loads
 from config import Config
 from logger import setup_logger
 
 logger = setup_logger('MQTT')
 
+# (초, ISO 문자열) - 같은 초 안에서는 문자열을 재사용
+_iso_cache = (0, '')
+
+def _iso_now() -> str:
+    """로컬 시각 ISO-8601 타임스탬프 (초 단위, 1초 동안 캐시)"""
+    global _iso_cache
+    now = int(time.time())
+    cached_sec, iso = _iso_cache
+    if now != cached_sec:
+        iso = time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(now))
+        _iso_cache = (now, iso)
+    return iso
+
 class MQTTClient:
     def __init__(self):
         self.client = None
         self.is_connected = False
-        self.topics = Config.get_mqtt_topics()
+        self._connected_event = threading.Event()
+        self._disconnected_event = threading.Event()  # 연결 전/끊김 상태에서 설정됨
+        self._disconnected_event.set()
+        self.topics = Config.MQTT_TOPICS
+        self._routes = Config.get_routes_config()
+        self._route_ids = list(self._routes.keys())
+        self._publish: Callable = None  # _on_connect에서 client.publish로 바인딩
+        self._topic_button = self.topics['button_press']
+        self._topic_status = self.topics['status']
+        self._topic_heartbeat = self.topics['heartbeat']
         self.message_callbacks: Dict[str, Callable] = {}
+        
+        # 수신 토픽 라우팅 테이블 (정확히 일치 → 접두사 일치 순)
+        self._exact_handlers: Dict[str, Callable] = {
+            self.topics['system_health']: self._handle_system_health,
+        }
+        self._prefix_handlers = (
+            (f"device/led/{Config.STOP_ID}/", self._handle_led_control),
+        )
+        
+        # 발행 메시지 템플릿 (고정 필드는 한 번만 구성)
+        self._heartbeat_message: Dict[str, Any] = {
+            'stopId': Config.STOP_ID,
+            'timestamp': None,
+            'uptime': 0.0,
+            'routes': self._route_ids
+        }
+        # route_id -> (topic, 타임스탬프 앞까지 직렬화한 페이로드) - 누를 때는 타임스탬프만 이어 붙임
+        self._button_messages: Dict[str, tuple] = {
+            route_id: (
+                f"{self._topic_button}/{route_id}",
+                _dumps({
+                    'stopId': Config.STOP_ID,
+                    'routeId': route_id,
+                    'routeName': route_config['name'],
+                    'buttonColor': route_config['color'],
+                    'passengerCount': 1
+                })[:-1] + b',"timestamp":"'
+            )
+            for route_id, route_config in self._routes.items()
+        }
         self.last_heartbeat = None
         self.heartbeat_thread = None
         self._running = False
@@ -42,11 +95,11 @@ class MQTTClient:
                 self.client.username_pw_set(Config.MQTT_USERNAME, Config.MQTT_PASSWORD)
             
             # 유언 메시지 설정 (정류장 오프라인 상태)
-            will_topic = self.topics['status']
-            will_message = json.dumps({
+            will_topic = self._topic_status
+            will_message = _dumps({
                 'status': 'offline',
                 'stopId': Config.STOP_ID,
-                'timestamp': datetime.now().isoformat()
+                'timestamp': _iso_now()
             })
             self.client.will_set(will_topic, will_message, qos=1, retain=True)
             
@@ -62,6 +115,7 @@ class MQTTClient:
         try:
             logger.info(f"MQTT 브로커 연결 시도: {Config.MQTT_BROKER_HOST}:{Config.MQTT_BROKER_PORT}")
             
+            self._connected_event.clear()
             self.client.connect(
                 Config.MQTT_BROKER_HOST,
                 Config.MQTT_BROKER_PORT,
@@ -72,13 +126,8 @@ class MQTTClient:
             self.client.loop_start()
             self._running = True
             
-            # 연결 대기 (최대 10초)
-            for _ in range(100):
-                if self.is_connected:
-                    break
-                time.sleep(0.1)
-            
-            if self.is_connected:
+            # 연결 대기 (최대 10초, _on_connect에서 이벤트 설정)
+            if self._connected_event.wait(timeout=10.0):
                 logger.info("MQTT 브로커 연결 성공")
                 self._start_heartbeat()
                 self._publish_status('online')
@@ -102,15 +151,25 @@ class MQTTClient:
             self._publish_status('offline')
             self.client.loop_stop()
             self.client.disconnect()
-            
+        
+        self._connected_event.clear()
         logger.info("MQTT 연결 해제 완료")
     
     def _on_connect(self, client, userdata, flags, rc):
         """연결 성공 콜백"""
         if rc == 0:
+            self._publish = client.publish
             self.is_connected = True
+            self._disconnected_event.clear()
+            self._connected_event.set()
             logger.info("MQTT 브로커 연결됨")
             
+            # Nagle 지연 없이 바로 전송 (재연결마다 소켓이 새로 만들어짐)
+            try:
+                client.socket().setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except (AttributeError, OSError) as e:
+                logger.debug("TCP_NODELAY 설정 실패: %s", e)
+            
             # 구독할 토픽들
             subscribe_topics = [
                 (self.topics['led_control'], 1),
@@ -127,6 +186,8 @@ class MQTTClient:
     def _on_disconnect(self, client, userdata, rc):
         """연결 해제 콜백"""
         self.is_connected = False
+        self._connected_event.clear()
+        self._disconnected_event.set()
         if rc != 0:
             logger.warning("MQTT 연결이 예기치 않게 끊어짐")
         else:
@@ -136,29 +197,39 @@ class MQTTClient:
         """메시지 수신 콜백"""
         try:
             topic = msg.topic
-            payload = json.loads(msg.payload.decode())
+            payload = _loads(msg.payload)
             
-            logger.debug(f"메시지 수신: {topic} -> {payload}")
+            logger.debug("메시지 수신: %s -> %s", topic, payload)
             
-            # LED 제어 메시지 처리
-            if topic.startswith(f"device/led/{Config.STOP_ID}/"):
-                route_id = topic.split('/')[-1]
-                callback = self.message_callbacks.get('led_control')
-                if callback:
-                    callback(route_id, payload)
+            handler = self._exact_handlers.get(topic)
+            if handler:
+                handler(topic, payload)
+                return
             
-            # 시스템 헬스 메시지 처리
-            elif topic == 'system/health':
-                callback = self.message_callbacks.get('system_health')
-                if callback:
-                    callback(payload)
+            # 접두사 핸들러에는 접두사 뒤 나머지 토픽을 전달
+            for prefix, handler in self._prefix_handlers:
+                if topic.startswith(prefix):
+                    handler(topic[len(prefix):], payload)
+                    break
             
         except Exception as e:
             logger.error(f"메시지 처리 오류: {e}")
     
+    def _handle_led_control(self, route_id: str, payload: dict):
+        """LED 제어 메시지 처리 (device/led/{stopId}/{routeId})"""
+        callback = self.message_callbacks.get('led_control')
+        if callback:
+            callback(route_id, payload)
+    
+    def _handle_system_health(self, topic: str, payload: dict):
+        """시스템 헬스 메시지 처리"""
+        callback = self.message_callbacks.get('system_health')
+        if callback:
+            callback(payload)
+    
     def _on_publish(self, client, userdata, mid):
         """메시지 발행 콜백"""
-        logger.debug(f"메시지 발행 완료: {mid}")
+        logger.debug("메시지 발행 완료: %s", mid)
     
     def _on_subscribe(self, client, userdata, mid, granted_qos):
         """구독 성공 콜백"""
@@ -169,27 +240,24 @@ class MQTTClient:
         self.message_callbacks[event_type] = callback
         logger.debug(f"콜백 등록: {event_type}")
     
-    def publish_button_press(self, route_id: str, route_name: str, color: str) -> bool:
-        """버튼 클릭 메시지 발행"""
+    def publish_button_press(self, route_id: str) -> bool:
+        """버튼 클릭 메시지 발행 (노선 이름/색상은 초기화 때 만든 템플릿에 포함)"""
         if not self.is_connected:
             logger.error("MQTT 연결되지 않음 - 버튼 클릭 전송 실패")
             return False
         
         try:
-            topic = f"{self.topics['button_press']}/{route_id}"
-            message = {
-                'stopId': Config.STOP_ID,
-                'routeId': route_id,
-                'routeName': route_name,
-                'buttonColor': color,
-                'timestamp': datetime.now().isoformat(),
-                'passengerCount': 1
-            }
+            cached = self._button_messages.get(route_id)
+            if cached is None:
+                logger.error("알 수 없는 노선: %s", route_id)
+                return False
+            topic, prefix = cached
             
-            result = self.client.publish(topic, json.dumps(message), qos=1)
+            # 템플릿은 읽기 전용 bytes이므로 여러 스레드에서 동시에 써도 안전
+            result = self._publish(topic, prefix + _iso_now().encode() + b'"}', qos=1)
             
             if result.rc == mqtt.MQTT_ERR_SUCCESS:
-                logger.info(f"버튼 클릭 전송: 노선 {route_id}")
+                logger.info("버튼 클릭 전송: 노선 %s", route_id)
                 return True
             else:
                 logger.error(f"버튼 클릭 전송 실패: {result.rc}")
@@ -208,11 +276,11 @@ class MQTTClient:
             'status': status,
             'stopId': Config.STOP_ID,
             'stopName': Config.STOP_NAME,
-            'timestamp': datetime.now().isoformat(),
-            'routes': list(Config.get_routes_config().keys())
+            'timestamp': _iso_now(),
+            'routes': self._route_ids
         }
         
-        self.client.publish(self.topics['status'], json.dumps(message), qos=1, retain=True)
+        self._publish(self._topic_status, _dumps(message), qos=1, retain=True)
         logger.info(f"정류장 상태 발행: {status}")
     
     def _publish_heartbeat(self):
@@ -220,14 +288,12 @@ class MQTTClient:
         if not self.is_connected:
             return
             
-        message = {
-            'stopId': Config.STOP_ID,
-            'timestamp': datetime.now().isoformat(),
-            'uptime': time.time() - (self.last_heartbeat or time.time()),
-            'routes': list(Config.get_routes_config().keys())
-        }
+        # 하트비트 스레드에서만 호출되므로 템플릿을 직접 갱신
+        message = self._heartbeat_message
+        message['timestamp'] = _iso_now()
+        message['uptime'] = time.time() - (self.last_heartbeat or time.time())
         
-        self.client.publish(self.topics['heartbeat'], json.dumps(message), qos=0)
+        self._publish(self._topic_heartbeat, _dumps(message), qos=0)
         self.last_heartbeat = time.time()
         logger.debug("하트비트 전송")
     
@@ -243,5 +309,9 @@ class MQTTClient:
         logger.info("하트비트 시작")
     
     def is_healthy(self) -> bool:
-        """MQTT 연결 상태 확인"""
-        return self.is_connected and self.client and self.client.is_connected() 
\ No newline at end of file
+        """MQTT 연결 상태 확인 (_on_connect/_on_disconnect에서 갱신되는 플래그)"""
+        return self.is_connected
+    
+    def wait_for_disconnect(self, timeout: float = None) -> bool:
+        """연결이 끊길 때까지 대기 (끊긴 상태면 True, 시간 초과면 False)"""
+        return self._disconnected_event.wait(timeout) 
\ No newline at end of file